@@ -6,13 +6,38 @@ Demonstrates adaptive AI that learns user patterns and predicts intent.
 """
 
 import asyncio
+import io
 import sys
-from pathlib import Path
+import threading
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'python'))
+from adaptive_ai import AdaptiveEngine, PatternLearner, get_intent_predictor, get_code_generator
 
-from adaptive_ai import AdaptiveEngine, IntentPredictor, PatternLearner, AdaptiveCodeGenerator
+
+class ThreadOutput:
+    """
+    sys.stdout proxy that buffers prints from threads running a captured demo,
+    so demos running concurrently don't interleave their output.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def capture(self, demo):
+        """Run a sync demo in the current thread and return its output."""
+        self.local.buffer = io.StringIO()
+        try:
+            demo()
+            return self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
 
 
 async def demo_adaptive_engine():
@@ -94,7 +119,7 @@ def demo_intent_predictor():
     print("=" * 70)
     print()
 
-    predictor = IntentPredictor()
+    predictor = get_intent_predictor()
 
     test_cases = [
         "I need to clean this CSV file with messy data",
@@ -177,7 +202,7 @@ def demo_code_generator():
     print("=" * 70)
     print()
 
-    generator = AdaptiveCodeGenerator()
+    generator = get_code_generator()
 
     # Demo: Data processing code
     print("Example 1: Data Processing Pipeline")
@@ -219,9 +244,9 @@ def demo_real_world_scenario():
     print()
 
     # Components
-    predictor = IntentPredictor()
+    predictor = get_intent_predictor()
     learner = PatternLearner()
-    generator = AdaptiveCodeGenerator()
+    generator = get_code_generator()
 
     # User's typical workflow
     print("🎬 Scene 1: AI learns from user's past behavior")
@@ -292,13 +317,27 @@ async def main():
     print("╚════════════════════════════════════════════════════════════════════╝")
     print()
 
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+
     try:
-        # Run demos
-        await demo_adaptive_engine()
-        demo_intent_predictor()
-        demo_pattern_learner()
-        demo_code_generator()
-        demo_real_world_scenario()
+        # Run demos concurrently: the sync demos share no state, so they run
+        # in worker threads while the engine demo waits on the network.
+        # Their output is buffered and printed in order afterwards.
+        results = await asyncio.gather(
+            demo_adaptive_engine(),
+            *(
+                asyncio.to_thread(output.capture, demo)
+                for demo in (
+                    demo_intent_predictor,
+                    demo_pattern_learner,
+                    demo_code_generator,
+                    demo_real_world_scenario,
+                )
+            )
+        )
+        for captured in results[1:]:
+            print(captured, end='')
 
         print()
         print("=" * 70)
@@ -324,6 +363,8 @@ async def main():
         print(f"\n\nError during demo: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        sys.stdout = output.stream
 
 
 if __name__ == "__main__":
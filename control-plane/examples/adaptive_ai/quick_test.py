@@ -3,13 +3,7 @@
 Quick test of Adaptive AI components
 """
 
-import sys
-from pathlib import Path
-
-# Add adaptive_ai to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'python'))
-
-from adaptive_ai import IntentPredictor, PatternLearner, AdaptiveCodeGenerator
+from adaptive_ai import PatternLearner, get_intent_predictor, get_code_generator
 
 
 def test_intent_predictor():
@@ -18,7 +12,7 @@ def test_intent_predictor():
     print("TEST 1: Intent Predictor")
     print("=" * 70)
 
-    predictor = IntentPredictor()
+    predictor = get_intent_predictor()
 
     test_cases = [
         "I need to clean this CSV file",
@@ -63,7 +57,7 @@ def test_code_generator():
     print("TEST 3: Code Generator")
     print("=" * 70)
 
-    generator = AdaptiveCodeGenerator()
+    generator = get_code_generator()
 
     code = generator.generate(
         intent='data_processing',
@@ -9,11 +9,14 @@ from .adaptive_engine import AdaptiveEngine
 from .intent_predictor import IntentPredictor
 from .pattern_learner import PatternLearner
 from .code_generator import AdaptiveCodeGenerator
+from .services import get_intent_predictor, get_code_generator
 
 __version__ = "1.0.0"
 __all__ = [
     "AdaptiveEngine",
     "IntentPredictor",
     "PatternLearner",
-    "AdaptiveCodeGenerator"
+    "AdaptiveCodeGenerator",
+    "get_intent_predictor",
+    "get_code_generator"
 ]
@@ -5,30 +5,80 @@ Learns from user interactions and adapts behavior in real-time.
 """
 
 import asyncio
-import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from collections import Counter, deque
+import os
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter, OrderedDict, deque
+from functools import partial
+from operator import itemgetter
 import aiohttp
 
+from . import fast_json
+
 
 class AdaptiveEngine:
     """
     Main adaptive AI engine that learns user patterns
     and predicts intent based on context and history.
+
+    Must be used as an async context manager (``async with AdaptiveEngine()``),
+    which opens the pooled HTTP session and the background action writer.
     """
 
-    def __init__(self, jarvis_url: str = "http://localhost:4000", api_key: str = "test-token"):
+    _JSON_HEADERS = {'Content-Type': 'application/json'}
+    _NOT_OPEN = "AdaptiveEngine is not open; use 'async with AdaptiveEngine(...) as engine'"
+
+    # Explanation templates, indexed by bisecting confidence over the thresholds
+    _EXPLANATION_THRESHOLDS = (0.5, 0.8)
+    _EXPLANATION_TEMPLATES = (
+        "You sometimes do '{action}', but I need more data to be certain ({samples} samples).",
+        "You often do '{action}' here ({percentage}% of {samples} times).",
+        "You almost always do '{action}' in this situation ({percentage}% of {samples} times).",
+    )
+
+    def __init__(
+        self,
+        jarvis_url: str = "http://localhost:4000",
+        api_key: str = "test-token",
+        cache_path: Optional[str] = None
+    ):
         self.jarvis_url = jarvis_url
         self.api_key = api_key
+        self.cache_path = cache_path
         self.session: Optional[aiohttp.ClientSession] = None
 
-        # Recent action buffer for sequence detection
-        self.action_buffer = deque(maxlen=20)
+        # Recent action buffer for sequence detection:
+        # (action, user_id, success, timestamp) tuples
+        self.action_buffer: deque = deque(maxlen=20)
 
-        # Pattern cache
-        self.pattern_cache: Dict[str, Any] = {}
+        # Pattern cache (LRU, oldest entry evicted first)
+        self.pattern_cache: OrderedDict[Tuple[str, str], Any] = OrderedDict()
         self.cache_ttl = 300  # 5 minutes
+        self.cache_max = 1024
+
+        # Predictions currently being computed, so concurrent callers
+        # for the same key share one memory recall. The engine owns these
+        # tasks; callers only shield-await them.
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # Per-user action counts, consecutive-pair counts and last action,
+        # maintained in observe_action; predictions fall back to them when
+        # the memory layer recalls nothing (down, or not yet written).
+        # User ids come from callers, so this is an LRU capped at user_max.
+        self._user_history: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self.user_max = 1024
+
+        # Upper bound for a single memory recall when fanning out
+        self.recall_timeout = 10.0
+
+        # Background writer for observed actions (started in __aenter__)
+        self.action_queue: Optional[asyncio.Queue] = None
+        self.write_batch_size = 32
+        self.write_interval = 0.1  # seconds to wait while filling a batch
+        self._writer: Optional[asyncio.Task] = None
 
         # Learning statistics
         self.stats = {
@@ -40,15 +90,69 @@ class AdaptiveEngine:
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            headers={'Authorization': f'Bearer {self.api_key}'}
-        )
+        # Before opening anything, so a failure here leaves nothing to close
+        if self.cache_path and os.path.exists(self.cache_path):
+            self.load_cache(self.cache_path)
+
+        self.session = self._create_session()
+        self.action_queue = asyncio.Queue(maxsize=1024)
+        self._writer = asyncio.create_task(self._drain_actions(self.action_queue))
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
+        # Predictions nobody is waiting for any more
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+        if self._writer and self.action_queue:
+            # Flush pending actions before tearing down the session
+            await self.action_queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+            self.action_queue = None
+
         if self.session:
             await self.session.close()
+            self.session = None
+        if self.cache_path:
+            self.save_cache(self.cache_path)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """
+        Create the shared HTTP session.
+
+        The pooled keep-alive connector lets concurrent recalls from
+        predict_intents() and bursts of predictions reuse open sockets
+        instead of paying a new handshake per request.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=128,
+            limit_per_host=32,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={'Authorization': f'Bearer {self.api_key}'},
+            timeout=aiohttp.ClientTimeout(total=5, connect=1)
+        )
+
+    def _require_session(self) -> aiohttp.ClientSession:
+        """Return the open session, or fail if used outside ``async with``."""
+        if self.session is None:
+            raise RuntimeError(self._NOT_OPEN)
+        return self.session
+
+    def _require_queue(self) -> asyncio.Queue:
+        """Return the action queue, or fail if used outside ``async with``."""
+        if self.action_queue is None:
+            raise RuntimeError(self._NOT_OPEN)
+        return self.action_queue
 
     async def predict_intent(self, context: str, user_id: str = "default") -> Dict[str, Any]:
         """
@@ -63,17 +167,46 @@ class AdaptiveEngine:
         """
 
         # Check cache first
-        cache_key = f"{user_id}:{context[:50]}"
-        if cache_key in self.pattern_cache:
-            cached = self.pattern_cache[cache_key]
-            if (datetime.now() - cached['timestamp']).seconds < self.cache_ttl:
-                return cached['prediction']
-
-        # Recall similar past interactions
+        cache_key = (user_id, context[:50])
+        cached = self.pattern_cache.get(cache_key)
+        if cached and time.monotonic() - cached['ts'] < self.cache_ttl:
+            self.pattern_cache.move_to_end(cache_key)
+            return cached['prediction']
+
+        # Join an identical prediction that is already in flight, or start
+        # one. Callers are shielded, so cancelling or timing out one of them
+        # doesn't cancel the shared prediction for the others.
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._predict_uncached(context, user_id, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(partial(self._finish_inflight, cache_key))
+
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, cache_key: Tuple[str, str], task: asyncio.Task) -> None:
+        """Forget a finished in-flight prediction."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled():
+            task.exception()  # Waiters still see it; don't log as unretrieved
+
+    async def _predict_uncached(
+        self,
+        context: str,
+        user_id: str,
+        cache_key: Tuple[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Compute a prediction and store it in the cache.
+        """
+        # Recall similar past interactions and analyze them
         memories = await self.recall_memories(context, user_id)
-
-        # Analyze patterns in memories
-        patterns = self.analyze_patterns(memories)
+        if memories:
+            patterns = self.analyze_patterns(memories)
+        else:
+            # Nothing recalled: use what this engine has observed locally
+            patterns = self.local_patterns(user_id)
 
         # Predict next action
         prediction = self.generate_prediction(context, patterns)
@@ -81,37 +214,76 @@ class AdaptiveEngine:
         # Cache the prediction
         self.pattern_cache[cache_key] = {
             'prediction': prediction,
-            'timestamp': datetime.now()
+            'ts': time.monotonic()
         }
+        self.pattern_cache.move_to_end(cache_key)
+        if len(self.pattern_cache) > self.cache_max:
+            self.pattern_cache.popitem(last=False)
 
         self.stats['predictions_made'] += 1
 
         return prediction
 
+    async def predict_intents(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Predict intent for many (context, user_id) pairs concurrently.
+
+        Memory recalls are issued in parallel, so total latency is close to
+        the slowest single recall rather than the sum of all of them.
+
+        Args:
+            items: List of (context, user_id) tuples
+
+        Returns:
+            List of predictions in the same order as items
+        """
+        self._require_session()
+
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(self.predict_intent(context, user_id), self.recall_timeout)
+                for context, user_id in items
+            ),
+            return_exceptions=True
+        )
+
+        predictions = []
+        for (context, user_id), result in zip(items, results):
+            if isinstance(result, BaseException):
+                # Timed out or failed: answer as if no memories were found,
+                # the same fallback _predict_uncached uses
+                result = self.generate_prediction(context, self.local_patterns(user_id))
+            predictions.append(result)
+
+        return predictions
+
     async def recall_memories(self, query: str, user_id: str, limit: int = 20) -> List[Dict]:
         """
         Retrieve similar past interactions from Jarvis memory layer.
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={'Authorization': f'Bearer {self.api_key}'}
-            )
+        return await self._recall_one(query, user_id, limit)
 
+    async def _recall_one(self, query: str, user_id: str, limit: int) -> List[Dict]:
+        """
+        POST a single recall request to the memory layer.
+        """
+        session = self._require_session()
         try:
-            async with self.session.post(
+            async with session.post(
                 f'{self.jarvis_url}/api/v1/memory/recall',
-                json={
+                data=fast_json.dumps({
                     'query': query,
                     'limit': limit,
                     'filter': {
                         'type': 'task',
                         'userId': user_id
                     }
-                }
+                }),
+                headers=self._JSON_HEADERS
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    return data.get('results', [])
+                    data = fast_json.loads(await response.read())
+                    return [self._project_memory(m) for m in data.get('results', [])]
                 elif response.status == 503:
                     # Memory layer not initialized, return empty
                     return []
@@ -122,6 +294,18 @@ class AdaptiveEngine:
             print(f"Error recalling memories: {e}")
             return []
 
+    @staticmethod
+    def _project_memory(memory: Dict) -> Dict:
+        """
+        Keep only the memory fields analyze_patterns reads, so the rest of
+        the recall response (embeddings, extra metadata) can be freed.
+        """
+        metadata = memory.get('metadata') or {}
+        return {
+            'content': memory.get('content', ''),
+            'metadata': {'action': metadata.get('action', 'unknown')}
+        }
+
     def analyze_patterns(self, memories: List[Dict]) -> Dict[str, Any]:
         """
         Analyze patterns in user's historical interactions.
@@ -134,16 +318,9 @@ class AdaptiveEngine:
                 'total_samples': 0
             }
 
-        # Extract actions from memories
-        actions = []
-        contexts = []
-        timestamps = []
-
-        for memory in memories:
-            metadata = memory.get('metadata', {})
-            actions.append(metadata.get('action', 'unknown'))
-            contexts.append(memory.get('content', ''))
-            timestamps.append(metadata.get('timestamp', ''))
+        # Extract actions from memories (only the first few contexts are reported)
+        actions = [memory.get('metadata', {}).get('action', 'unknown') for memory in memories]
+        contexts = [memory.get('content', '') for memory in memories[:5]]
 
         # Count action frequencies
         action_counts = Counter(actions)
@@ -151,40 +328,55 @@ class AdaptiveEngine:
         # Detect sequences (if we have enough data)
         sequences = self.detect_sequences(actions) if len(actions) >= 3 else []
 
-        # Calculate pattern strength
-        most_common = action_counts.most_common(1)
-        confidence = most_common[0][1] / len(actions) if most_common else 0.0
+        # Calculate pattern strength (single pass, no heap needed for top-1)
+        top_action, top_count = max(action_counts.items(), key=itemgetter(1))
+        confidence = top_count / len(actions)
 
         return {
             'actions': action_counts,
             'sequences': sequences,
             'confidence': confidence,
             'total_samples': len(memories),
-            'most_common_action': most_common[0][0] if most_common else None,
-            'contexts': contexts[:5]  # Sample contexts
+            'most_common_action': top_action,
+            'contexts': contexts  # Sample contexts
         }
 
-    def detect_sequences(self, actions: List[str], min_length: int = 2) -> List[List[str]]:
+    def local_patterns(self, user_id: str) -> Dict[str, Any]:
         """
-        Detect common action sequences (e.g., always does A then B).
+        Build patterns from actions observed locally for this user.
+
+        Returns the same shape as analyze_patterns().
         """
-        sequences = []
+        history = self._user_history.get(user_id)
+        if not history:
+            return self.analyze_patterns([])
 
-        # Look for 2-action sequences
-        for i in range(len(actions) - 1):
-            seq = [actions[i], actions[i + 1]]
-            sequences.append(seq)
+        action_counts = history['counts']
+        total = sum(action_counts.values())
+        top_action, top_count = max(action_counts.items(), key=itemgetter(1))
 
-        # Count sequence frequencies
-        seq_counter = Counter([tuple(s) for s in sequences])
+        return {
+            'actions': action_counts,
+            'sequences': [
+                list(pair) for pair, count in history['pairs'].items()
+                if count > 1
+            ],
+            'confidence': top_count / total,
+            'total_samples': total,
+            'most_common_action': top_action,
+            'contexts': []
+        }
 
-        # Return sequences that appear more than once
-        common_sequences = [
-            list(seq) for seq, count in seq_counter.items()
-            if count > 1
-        ]
+    def detect_sequences(self, actions: List[str], min_length: int = 2) -> List[List[str]]:
+        """
+        Detect common action sequences (e.g., always does A then B).
+        """
+        # Count consecutive n-grams (pairs by default) straight off the iterator
+        ngrams = zip(*(actions[i:] for i in range(min_length)))
+        seq_counter = Counter(ngrams)
 
-        return common_sequences
+        # Return sequences that appear more than once
+        return [list(seq) for seq, count in seq_counter.items() if count > 1]
 
     def generate_prediction(self, context: str, patterns: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -225,41 +417,98 @@ class AdaptiveEngine:
         if not action or samples == 0:
             return "No patterns detected yet. I'm still learning your preferences."
 
-        percentage = int(confidence * 100)
-
-        if confidence >= 0.8:
-            return f"You almost always do '{action}' in this situation ({percentage}% of {samples} times)."
-        elif confidence >= 0.5:
-            return f"You often do '{action}' here ({percentage}% of {samples} times)."
-        else:
-            return f"You sometimes do '{action}', but I need more data to be certain ({samples} samples)."
+        template = self._EXPLANATION_TEMPLATES[bisect_right(self._EXPLANATION_THRESHOLDS, confidence)]
+        return template.format(action=action, percentage=int(confidence * 100), samples=samples)
 
     async def observe_action(self, action: Dict[str, Any]) -> None:
         """
         Observe and learn from user action.
+
+        The action is queued and written to Jarvis memory by a background
+        task, so callers don't wait on the round-trip.
         """
-        # Add to action buffer
-        self.action_buffer.append(action)
+        # Fail before touching any state if the engine isn't open
+        queue = self._require_queue()
+
+        # Add a compact record to the action buffer; descriptions and contexts
+        # go to Jarvis memory and don't need to stay alive here
+        act = sys.intern(str(action.get('action', 'unknown')))
+        uid = sys.intern(str(self._action_user(action)))
+        self.action_buffer.append((act, uid, bool(action.get('success', True)), time.time()))
+
+        # Update per-user action and pair counts incrementally
+        history = self._user_history.get(uid)
+        if history is None:
+            history = self._user_history[uid] = {'counts': Counter(), 'pairs': Counter(), 'last': None}
+            if len(self._user_history) > self.user_max:
+                self._user_history.popitem(last=False)
+        else:
+            self._user_history.move_to_end(uid)
+
+        history['counts'][act] += 1
+        if history['last'] is not None:
+            history['pairs'][(history['last'], act)] += 1
+        history['last'] = act
 
         # Store in Jarvis memory
-        if self.session:
+        await queue.put(action)
+
+    async def _drain_actions(self, queue: asyncio.Queue) -> None:
+        """
+        Background writer: store queued actions in batches.
+
+        Collects up to write_batch_size actions, waiting at most
+        write_interval for the batch to fill, then writes them concurrently.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.write_interval
+
+            while len(batch) < self.write_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
             try:
-                await self.session.post(
-                    f'{self.jarvis_url}/api/v1/memory/remember',
-                    json={
-                        'content': action.get('description', str(action)),
-                        'metadata': {
-                            'type': 'task',
-                            'action': action.get('action', 'unknown'),
-                            'userId': action.get('user_id', 'default'),
-                            'success': action.get('success', True),
-                            'context': action.get('context', '')
-                        }
+                await asyncio.gather(*(self._store_action(action) for action in batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _store_action(self, action: Dict[str, Any]) -> None:
+        """
+        POST a single action to the memory layer.
+        """
+        session = self._require_session()
+        try:
+            async with session.post(
+                f'{self.jarvis_url}/api/v1/memory/remember',
+                data=fast_json.dumps({
+                    'content': action.get('description', str(action)),
+                    'metadata': {
+                        'type': 'task',
+                        'action': action.get('action', 'unknown'),
+                        'userId': self._action_user(action),
+                        'success': action.get('success', True),
+                        'context': action.get('context', '')
                     }
-                )
+                }),
+                headers=self._JSON_HEADERS
+            ):
                 self.stats['interactions_tracked'] += 1
-            except Exception as e:
-                print(f"Error storing action: {e}")
+        except Exception as e:
+            print(f"Error storing action: {e}")
+
+    @staticmethod
+    def _action_user(action: Dict[str, Any]) -> Any:
+        """User id of an observed action, under 'user_id' or the wire name 'userId'."""
+        return action.get('user_id', action.get('userId', 'default'))
 
     async def provide_feedback(self, prediction_id: str, was_correct: bool) -> None:
         """
@@ -289,3 +538,66 @@ class AdaptiveEngine:
     def clear_cache(self) -> None:
         """Clear pattern cache."""
         self.pattern_cache.clear()
+
+    def save_cache(self, filepath: str) -> None:
+        """
+        Save unexpired cached predictions to file.
+
+        Monotonic timestamps are meaningless across processes, so each entry
+        is stored with a wall-clock expiry instead.
+        """
+        now = time.monotonic()
+        wall_now = time.time()
+
+        entries = [
+            {
+                'key': key,
+                'prediction': cached['prediction'],
+                'expires_at': wall_now + self.cache_ttl - (now - cached['ts'])
+            }
+            for key, cached in self.pattern_cache.items()
+            if now - cached['ts'] < self.cache_ttl
+        ]
+
+        # Write a sibling temp file and swap it in, so a crash mid-write
+        # never leaves a truncated cache behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(fast_json.dumps(entries))
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load_cache(self, filepath: str) -> None:
+        """
+        Load cached predictions from file, skipping expired entries.
+
+        A corrupt or malformed file is treated as an empty cache.
+        """
+        now = time.monotonic()
+        wall_now = time.time()
+
+        # Parse every entry before touching the cache, so a bad file
+        # doesn't leave it half loaded
+        loaded: Dict[Tuple[str, str], Any] = {}
+        try:
+            with open(filepath, 'rb') as f:
+                entries = fast_json.loads(f.read())
+
+            for entry in entries:
+                remaining = entry['expires_at'] - wall_now
+                if remaining <= 0:
+                    continue
+                loaded[tuple(entry['key'])] = {
+                    'prediction': entry['prediction'],
+                    'ts': now - (self.cache_ttl - remaining)
+                }
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"Warning: Ignoring corrupt prediction cache {filepath}: {e!r}")
+            return
+
+        self.pattern_cache.update(loaded)
+        while len(self.pattern_cache) > self.cache_max:
+            self.pattern_cache.popitem(last=False)
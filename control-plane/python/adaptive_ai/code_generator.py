@@ -4,78 +4,14 @@ Adaptive Code Generator
 Generates code adapted to user's coding style and patterns.
 """
 
+from types import MappingProxyType
 from typing import Dict, List, Optional
-import json
-
-
-class AdaptiveCodeGenerator:
-    """
-    Generates code based on learned user patterns and preferences.
-    """
-
-    def __init__(self):
-        # Code templates by intent
-        self.templates = {
-            'data_processing': self.generate_data_processing,
-            'data_loading': self.generate_data_loading,
-            'data_analysis': self.generate_data_analysis,
-            'api_request': self.generate_api_request,
-            'api_post': self.generate_api_post,
-            'file_creation': self.generate_file_creation,
-            'file_manipulation': self.generate_file_manipulation,
-            'code_generation': self.generate_function,
-            'testing': self.generate_test,
-            'debugging': self.generate_debug_code,
-        }
-
-        # User preferences (learned over time)
-        self.user_preferences = {
-            'imports_style': 'grouped',  # 'grouped' or 'inline'
-            'preferred_libs': ['pandas', 'requests', 'asyncio'],
-            'naming_convention': 'snake_case',
-            'add_type_hints': True,
-            'add_docstrings': True,
-            'error_handling': 'try_except',  # 'try_except' or 'if_check'
-        }
-
-    def generate(
-        self,
-        intent: str,
-        context: Dict,
-        patterns: Optional[Dict] = None
-    ) -> str:
-        """
-        Generate code based on intent and learned patterns.
-
-        Args:
-            intent: User intent (e.g., 'data_processing')
-            context: Context info (file paths, data descriptions, etc.)
-            patterns: Learned user patterns
-
-        Returns:
-            Generated Python code as string
-        """
-        # Get template function for this intent
-        template_func = self.templates.get(intent)
-
-        if not template_func:
-            return f"# No template for intent: {intent}\n# Context: {context}"
-
-        # Generate code using template
-        code = template_func(context, patterns)
-
-        # Apply user style preferences
-        code = self.apply_style_preferences(code, patterns)
 
-        return code
-
-    def generate_data_processing(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate data processing pipeline."""
+# Code templates, built once at import. *_TEMPLATE strings and the
+# _DATA_PROCESSING_* fragments are filled with str.format (so literal braces
+# are doubled); *_CODE strings and other fragments are emitted as-is.
 
-        file_path = context.get('file_path', 'data.csv')
-        operations = context.get('operations', ['clean', 'transform'])
-
-        code = f"""import pandas as pd
+_DATA_PROCESSING_HEADER = """import pandas as pd
 from typing import Optional
 
 def process_data(file_path: str = "{file_path}") -> pd.DataFrame:
@@ -97,21 +33,19 @@ def process_data(file_path: str = "{file_path}") -> pd.DataFrame:
 
 """
 
-        if 'clean' in operations:
-            code += """    # Clean data
+_DATA_PROCESSING_CLEAN = """    # Clean data
     df = df[df['value'] > 0]  # Remove invalid values
     df['column'] = df['column'].str.strip()  # Clean strings
 
 """
 
-        if 'transform' in operations:
-            code += """    # Transform data
+_DATA_PROCESSING_TRANSFORM = """    # Transform data
     df['date'] = pd.to_datetime(df['date'])
     df['processed_at'] = pd.Timestamp.now()
 
 """
 
-        code += """    print(f"Processed {{len(df)}} rows")
+_DATA_PROCESSING_FOOTER = """    print(f"Processed {{len(df)}} rows")
     return df
 
 # Execute
@@ -120,24 +54,19 @@ if __name__ == "__main__":
     print(df.head())
 """
 
-        return code
-
-    def generate_data_loading(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate data loading code."""
-
-        file_path = context.get('file_path', 'data.csv')
-        file_type = context.get('file_type', 'csv')
-
-        loaders = {
-            'csv': 'pd.read_csv',
-            'json': 'pd.read_json',
-            'excel': 'pd.read_excel',
-            'parquet': 'pd.read_parquet'
-        }
-
-        loader = loaders.get(file_type, 'pd.read_csv')
+# Every clean/transform combination, keyed by (clean, transform)
+_DATA_PROCESSING_VARIANTS = MappingProxyType({
+    (clean, transform): "".join((
+        _DATA_PROCESSING_HEADER,
+        _DATA_PROCESSING_CLEAN if clean else "",
+        _DATA_PROCESSING_TRANSFORM if transform else "",
+        _DATA_PROCESSING_FOOTER,
+    ))
+    for clean in (False, True)
+    for transform in (False, True)
+})
 
-        code = f"""import pandas as pd
+_DATA_LOADING_TEMPLATE = """import pandas as pd
 
 def load_data(file_path: str = "{file_path}") -> pd.DataFrame:
     \"\"\"Load data from {file_type} file.\"\"\"
@@ -155,12 +84,7 @@ df = load_data()
 print(df.head())
 """
 
-        return code
-
-    def generate_data_analysis(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate data analysis code."""
-
-        code = """import pandas as pd
+_DATA_ANALYSIS_CODE = """import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -208,16 +132,7 @@ def analyze_data(df: pd.DataFrame) -> None:
 analyze_data(df)
 """
 
-        return code
-
-    def generate_api_request(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate API request code."""
-
-        url = context.get('url', 'https://api.example.com/data')
-        method = context.get('method', 'GET')
-        auth = context.get('auth', False)
-
-        code = f"""import requests
+_API_REQUEST_HEADER = """import requests
 from typing import Dict, Optional
 import json
 
@@ -231,15 +146,14 @@ def make_api_request(
     \"\"\"
 """
 
-        if auth:
-            code += """    # Add authentication (adjust as needed)
+_API_REQUEST_AUTH = """    # Add authentication (adjust as needed)
     if not headers:
         headers = {}
     headers['Authorization'] = 'Bearer YOUR_API_KEY'
 
 """
 
-        code += """    try:
+_API_REQUEST_BODY = """    try:
         response = requests.get(url, params=params, headers=headers, timeout=30)
         response.raise_for_status()
 
@@ -259,14 +173,7 @@ data = make_api_request()
 print(json.dumps(data, indent=2))
 """
 
-        return code
-
-    def generate_api_post(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate API POST request code."""
-
-        url = context.get('url', 'https://api.example.com/data')
-
-        code = f"""import requests
+_API_POST_TEMPLATE = """import requests
 import json
 from typing import Dict
 
@@ -305,16 +212,7 @@ def post_data(url: str = "{url}", data: Dict = None) -> Dict:
 result = post_data()
 """
 
-        return code
-
-    def generate_file_creation(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate file creation code."""
-
-        filename = context.get('filename', 'output.txt')
-        content_type = context.get('content_type', 'text')
-
-        if content_type == 'json':
-            code = f"""import json
+_JSON_FILE_TEMPLATE = """import json
 
 def save_json(data: dict, filename: str = "{filename}"):
     \"\"\"Save data to JSON file.\"\"\"
@@ -330,8 +228,8 @@ data = {{
 
 save_json(data)
 """
-        else:
-            code = f"""def save_file(content: str, filename: str = "{filename}"):
+
+_TEXT_FILE_TEMPLATE = """def save_file(content: str, filename: str = "{filename}"):
     \"\"\"Save content to file.\"\"\"
     with open(filename, 'w') as f:
         f.write(content)
@@ -342,12 +240,7 @@ content = "Your content here"
 save_file(content)
 """
 
-        return code
-
-    def generate_file_manipulation(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate file manipulation code."""
-
-        code = """import shutil
+_FILE_MANIPULATION_CODE = """import shutil
 from pathlib import Path
 
 def copy_file(src: str, dest: str):
@@ -375,15 +268,7 @@ def delete_file(path: str):
 # delete_file('temp.txt')
 """
 
-        return code
-
-    def generate_function(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate generic function template."""
-
-        func_name = context.get('function_name', 'my_function')
-        description = context.get('description', 'Function description')
-
-        code = f"""def {func_name}(param1, param2=None):
+_FUNCTION_TEMPLATE = """def {func_name}(param1, param2=None):
     \"\"\"
     {description}
 
@@ -408,14 +293,7 @@ if __name__ == "__main__":
     print(f"Result: {{result}}")
 """
 
-        return code
-
-    def generate_test(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate test code."""
-
-        func_name = context.get('function_name', 'my_function')
-
-        code = f"""import pytest
+_TEST_TEMPLATE = """import pytest
 
 def test_{func_name}():
     \"\"\"Test {func_name} with various inputs.\"\"\"
@@ -438,12 +316,7 @@ if __name__ == "__main__":
     test_{func_name}()
 """
 
-        return code
-
-    def generate_debug_code(self, context: Dict, patterns: Optional[Dict]) -> str:
-        """Generate debugging helpers."""
-
-        code = """import traceback
+_DEBUG_CODE = """import traceback
 import sys
 from typing import Any
 
@@ -474,8 +347,159 @@ def safe_execute(func, *args, **kwargs):
 # Debug helpers ready to use
 """
 
+
+class AdaptiveCodeGenerator:
+    """
+    Generates code based on learned user patterns and preferences.
+    """
+
+    # Template method names by intent, shared by all instances
+    _TEMPLATE_METHOD_NAMES = MappingProxyType({
+        'data_processing': 'generate_data_processing',
+        'data_loading': 'generate_data_loading',
+        'data_analysis': 'generate_data_analysis',
+        'api_request': 'generate_api_request',
+        'api_post': 'generate_api_post',
+        'file_creation': 'generate_file_creation',
+        'file_manipulation': 'generate_file_manipulation',
+        'code_generation': 'generate_function',
+        'testing': 'generate_test',
+        'debugging': 'generate_debug_code',
+    })
+
+    def __init__(self):
+        # User preferences (learned over time)
+        self.user_preferences = {
+            'imports_style': 'grouped',  # 'grouped' or 'inline'
+            'preferred_libs': ['pandas', 'requests', 'asyncio'],
+            'naming_convention': 'snake_case',
+            'add_type_hints': True,
+            'add_docstrings': True,
+            'error_handling': 'try_except',  # 'try_except' or 'if_check'
+        }
+
+    def generate(
+        self,
+        intent: str,
+        context: Dict,
+        patterns: Optional[Dict] = None
+    ) -> str:
+        """
+        Generate code based on intent and learned patterns.
+
+        Args:
+            intent: User intent (e.g., 'data_processing')
+            context: Context info (file paths, data descriptions, etc.)
+            patterns: Learned user patterns
+
+        Returns:
+            Generated Python code as string
+        """
+        # Get template method for this intent
+        method_name = self._TEMPLATE_METHOD_NAMES.get(intent)
+
+        if not method_name:
+            return f"# No template for intent: {intent}\n# Context: {context}"
+
+        # Generate code using template
+        code = getattr(self, method_name)(context, patterns)
+
+        # Apply user style preferences
+        code = self.apply_style_preferences(code, patterns)
+
         return code
 
+    def generate_data_processing(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate data processing pipeline."""
+
+        file_path = context.get('file_path', 'data.csv')
+        operations = context.get('operations', ['clean', 'transform'])
+
+        template = _DATA_PROCESSING_VARIANTS['clean' in operations, 'transform' in operations]
+        return template.format(file_path=file_path)
+
+    def generate_data_loading(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate data loading code."""
+
+        file_path = context.get('file_path', 'data.csv')
+        file_type = context.get('file_type', 'csv')
+
+        loaders = {
+            'csv': 'pd.read_csv',
+            'json': 'pd.read_json',
+            'excel': 'pd.read_excel',
+            'parquet': 'pd.read_parquet'
+        }
+
+        loader = loaders.get(file_type, 'pd.read_csv')
+
+        return _DATA_LOADING_TEMPLATE.format(
+            file_path=file_path,
+            file_type=file_type,
+            loader=loader
+        )
+
+    def generate_data_analysis(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate data analysis code."""
+
+        return _DATA_ANALYSIS_CODE
+
+    def generate_api_request(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate API request code."""
+
+        url = context.get('url', 'https://api.example.com/data')
+        auth = context.get('auth', False)
+
+        parts = [_API_REQUEST_HEADER.format(url=url)]
+        if auth:
+            parts.append(_API_REQUEST_AUTH)
+        parts.append(_API_REQUEST_BODY)
+
+        return "".join(parts)
+
+    def generate_api_post(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate API POST request code."""
+
+        url = context.get('url', 'https://api.example.com/data')
+
+        return _API_POST_TEMPLATE.format(url=url)
+
+    def generate_file_creation(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate file creation code."""
+
+        filename = context.get('filename', 'output.txt')
+        content_type = context.get('content_type', 'text')
+
+        if content_type == 'json':
+            return _JSON_FILE_TEMPLATE.format(filename=filename)
+
+        return _TEXT_FILE_TEMPLATE.format(filename=filename)
+
+    def generate_file_manipulation(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate file manipulation code."""
+
+        return _FILE_MANIPULATION_CODE
+
+    def generate_function(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate generic function template."""
+
+        func_name = context.get('function_name', 'my_function')
+        description = context.get('description', 'Function description')
+
+        return _FUNCTION_TEMPLATE.format(func_name=func_name, description=description)
+
+    def generate_test(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate test code."""
+
+        func_name = context.get('function_name', 'my_function')
+
+        return _TEST_TEMPLATE.format(func_name=func_name)
+
+    def generate_debug_code(self, context: Dict, patterns: Optional[Dict]) -> str:
+        """Generate debugging helpers."""
+
+        return _DEBUG_CODE
+
     def apply_style_preferences(self, code: str, patterns: Optional[Dict]) -> str:
         """Apply user's coding style preferences."""
 
@@ -0,0 +1,28 @@
+"""
+Fast JSON - serialization helpers
+
+Uses orjson when it is installed and falls back to the standard library.
+Both paths produce compact UTF-8 bytes and accept bytes or str.
+"""
+
+from typing import Any, Union
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -4,9 +4,34 @@ Intent Predictor - Specialized intent classification
 Predicts user intent from natural language input.
 """
 
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
 import re
 
+_WORD_RE = re.compile(r'\w+')
+
+
+def _tokenize(text: str) -> FrozenSet[str]:
+    """Lowercase text once and return its set of words."""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+# Common action sequences: (second-to-last, last) -> (next action, confidence)
+_SEQUENCES = {
+    ('data_loading', 'data_processing'): ('data_analysis', 0.8),
+    ('data_analysis', 'data_visualization'): ('reporting', 0.7),
+    ('code_generation', 'testing'): ('debugging', 0.6),
+    ('debugging', 'testing'): ('deployment', 0.7),
+    ('api_request', 'api_request'): ('api_request', 0.5),  # Batch requests
+}
+
+# Simple continuations: last action -> (next action, confidence)
+_CONTINUATIONS = {
+    'data_loading': ('data_processing', 0.6),
+    'code_generation': ('testing', 0.5),
+    'testing': ('debugging', 0.4),
+}
+
 
 class IntentPredictor:
     """
@@ -15,46 +40,57 @@ class IntentPredictor:
     """
 
     def __init__(self):
-        # Intent patterns (regex -> intent mapping)
+        # Intent patterns (regex -> intent mapping, matched case-insensitively)
         self.intent_patterns = {
             # Data processing intents
-            r'(?i)(clean|process|transform|parse).{0,20}(data|csv|json|file)': 'data_processing',
-            r'(?i)(load|read|import).{0,20}(data|file|csv|json)': 'data_loading',
-            r'(?i)(analyze|visualize|plot|graph)': 'data_analysis',
+            r'(clean|process|transform|parse).{0,20}(data|csv|json|file)': 'data_processing',
+            r'(load|read|import).{0,20}(data|file|csv|json)': 'data_loading',
+            r'(analyze|visualize|plot|graph)': 'data_analysis',
 
             # API/Network intents
-            r'(?i)(call|request|fetch|get).{0,20}(api|endpoint|url)': 'api_request',
-            r'(?i)(post|send|submit).{0,20}(to|data|api)': 'api_post',
+            r'(call|request|fetch|get).{0,20}(api|endpoint|url)': 'api_request',
+            r'(post|send|submit).{0,20}(to|data|api)': 'api_post',
 
             # File operations
-            r'(?i)(create|write|save).{0,20}(file|document)': 'file_creation',
-            r'(?i)(delete|remove).{0,20}(file|folder)': 'file_deletion',
-            r'(?i)(move|copy).{0,20}(file|folder)': 'file_manipulation',
+            r'(create|write|save).{0,20}(file|document)': 'file_creation',
+            r'(delete|remove).{0,20}(file|folder)': 'file_deletion',
+            r'(move|copy).{0,20}(file|folder)': 'file_manipulation',
 
             # Code generation
-            r'(?i)(write|create|generate).{0,20}(function|class|code)': 'code_generation',
-            r'(?i)(fix|debug|solve).{0,20}(bug|error|issue)': 'debugging',
-            r'(?i)(refactor|optimize|improve)': 'code_optimization',
+            r'(write|create|generate).{0,20}(function|class|code)': 'code_generation',
+            r'(fix|debug|solve).{0,20}(bug|error|issue)': 'debugging',
+            r'(refactor|optimize|improve)': 'code_optimization',
 
             # Testing
-            r'(?i)(test|unit test|integration test)': 'testing',
-            r'(?i)(validate|verify|check)': 'validation',
+            r'(test|unit test|integration test)': 'testing',
+            r'(validate|verify|check)': 'validation',
 
             # Deployment
-            r'(?i)(deploy|release|publish)': 'deployment',
-            r'(?i)(build|compile|package)': 'build',
+            r'(deploy|release|publish)': 'deployment',
+            r'(build|compile|package)': 'build',
 
             # Documentation
-            r'(?i)(document|explain|comment)': 'documentation',
-            r'(?i)(help|guide|tutorial)': 'help_request',
+            r'(document|explain|comment)': 'documentation',
+            r'(help|guide|tutorial)': 'help_request',
         }
 
+        # Compile once; matching is case-insensitive
+        self._compiled_patterns: List[Tuple[Pattern, str]] = [
+            (re.compile(pattern, re.IGNORECASE), intent)
+            for pattern, intent in self.intent_patterns.items()
+        ]
+
+        # Repeated inputs (retries, autocomplete) skip regex matching entirely.
+        # Cached per instance because the patterns are per instance.
+        self._match_cached = lru_cache(maxsize=4096)(self._match_uncached)
+
         # Intent confidence boosters (words that increase confidence)
+        # Stored as sets so matching is one intersection with the text's words
         self.confidence_boosters = {
-            'data_processing': ['pandas', 'numpy', 'clean', 'transform'],
-            'api_request': ['requests', 'http', 'fetch', 'endpoint'],
-            'code_generation': ['function', 'class', 'method', 'implement'],
-            'testing': ['pytest', 'unittest', 'test', 'assert'],
+            'data_processing': frozenset({'pandas', 'numpy', 'clean', 'transform'}),
+            'api_request': frozenset({'requests', 'http', 'fetch', 'endpoint'}),
+            'code_generation': frozenset({'function', 'class', 'method', 'implement'}),
+            'testing': frozenset({'pytest', 'unittest', 'test', 'assert'}),
         }
 
     def predict(self, text: str, context: Optional[Dict] = None) -> Tuple[str, float]:
@@ -75,7 +111,7 @@ class IntentPredictor:
             # Boost confidence based on context
             boosted_confidence = self.boost_confidence(
                 matched_intent,
-                text,
+                _tokenize(text),
                 base_confidence,
                 context
             )
@@ -84,12 +120,36 @@ class IntentPredictor:
         # Fallback: unknown intent
         return 'unknown', 0.0
 
+    def predict_batch(
+        self,
+        texts: List[str],
+        contexts: Optional[List[Optional[Dict]]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Predict intents for many inputs in one call.
+
+        Args:
+            texts: User input texts
+            contexts: Optional per-text contexts, parallel to texts
+
+        Returns:
+            List of (intent, confidence) tuples, in input order
+        """
+        if contexts is None:
+            contexts = [None] * len(texts)
+        predict = self.predict
+        return [predict(text, context) for text, context in zip(texts, contexts)]
+
     def match_patterns(self, text: str) -> Tuple[Optional[str], float]:
         """
         Match text against intent patterns.
         """
-        for pattern, intent in self.intent_patterns.items():
-            if re.search(pattern, text):
+        return self._match_cached(text)
+
+    def _match_uncached(self, text: str) -> Tuple[Optional[str], float]:
+        """Run the intent patterns in priority order."""
+        for pattern, intent in self._compiled_patterns:
+            if pattern.search(text):
                 # Base confidence for pattern match
                 return intent, 0.6
 
@@ -98,21 +158,23 @@ class IntentPredictor:
     def boost_confidence(
         self,
         intent: str,
-        text: str,
+        tokens: FrozenSet[str],
         base_confidence: float,
         context: Optional[Dict]
     ) -> float:
         """
         Boost confidence based on additional signals.
+
+        Args:
+            tokens: Lowercase word set of the input, as from _tokenize()
         """
         confidence = base_confidence
 
         # Check for confidence booster keywords
         if intent in self.confidence_boosters:
             keywords = self.confidence_boosters[intent]
-            text_lower = text.lower()
 
-            matches = sum(1 for keyword in keywords if keyword in text_lower)
+            matches = len(keywords & tokens)
             confidence += min(matches * 0.1, 0.3)
 
         # Boost based on context (e.g., recent similar actions)
@@ -132,33 +194,16 @@ class IntentPredictor:
         if not action_sequence:
             return 'unknown', 0.0
 
-        # Common action sequences
-        sequences = {
-            ('data_loading', 'data_processing'): ('data_analysis', 0.8),
-            ('data_analysis', 'data_visualization'): ('reporting', 0.7),
-            ('code_generation', 'testing'): ('debugging', 0.6),
-            ('debugging', 'testing'): ('deployment', 0.7),
-            ('api_request', 'api_request'): ('api_request', 0.5),  # Batch requests
-        }
-
-        # Check last 2 actions
+        # Check last 2 actions against common sequences
         if len(action_sequence) >= 2:
-            last_two = tuple(action_sequence[-2:])
-            if last_two in sequences:
-                return sequences[last_two]
+            prediction = _SEQUENCES.get((action_sequence[-2], action_sequence[-1]))
+            if prediction:
+                return prediction
 
         # Check last action for simple continuation
-        last_action = action_sequence[-1]
-
-        # Simple continuations
-        continuations = {
-            'data_loading': ('data_processing', 0.6),
-            'code_generation': ('testing', 0.5),
-            'testing': ('debugging', 0.4),
-        }
-
-        if last_action in continuations:
-            return continuations[last_action]
+        prediction = _CONTINUATIONS.get(action_sequence[-1])
+        if prediction:
+            return prediction
 
         return 'unknown', 0.0
 
@@ -4,9 +4,14 @@ Pattern Learner - ML-based pattern learning
 Learns patterns from user interactions using simple ML.
 """
 
-from typing import Dict, List, Any
+import sys
+from typing import Any, BinaryIO, Dict, FrozenSet, List, Optional, Set, Tuple
 from collections import defaultdict, Counter
-import json
+
+from . import fast_json
+
+# Minimum Jaccard word overlap for two contexts to count as similar
+SIMILARITY_THRESHOLD = 0.3
 
 
 class PatternLearner:
@@ -15,22 +20,44 @@ class PatternLearner:
     Uses simple statistical learning (can be upgraded to ML models).
     """
 
-    def __init__(self):
+    def __init__(self, event_log: Optional[str] = None) -> None:
+        """
+        Args:
+            event_log: Optional NDJSON file that observe() and observe_sequence()
+                append to, so new observations survive without a full save()
+        """
         # Action sequences
         self.sequences: List[List[str]] = []
 
+        # Next-action counts derived from sequences: {action: Counter(next_action)}
+        self._bigram_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+
         # Action contexts (what led to each action)
         self.action_contexts: Dict[str, List[str]] = defaultdict(list)
 
-        # Success rates per action
-        self.action_success: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: {'success': 0, 'failure': 0}
-        )
+        # Lowercased word sets of each stored context, parallel to action_contexts
+        self._ctx_tokens: Dict[str, List[FrozenSet[str]]] = defaultdict(list)
+
+        # Inverted index: word -> [(action, index into _ctx_tokens[action])]
+        self._word_postings: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+
+        # Success/failure counts per action as compact [success, failure] pairs
+        self.action_success: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+        # Time-of-day patterns as per-action hour counts (at most 24 entries,
+        # however many observations), in first-seen order
+        self.time_patterns: Dict[str, Counter[int]] = defaultdict(Counter)
 
-        # Time-of-day patterns
-        self.time_patterns: Dict[str, List[int]] = defaultdict(list)
+        # Running observation counts for get_stats
+        self._action_totals: Counter[str] = Counter()
+        self._total_observations = 0
 
-    def observe(self, action: str, context: str, success: bool = True, hour: int = 12):
+        # Unbuffered append handle: one write() per event
+        self._event_file: Optional[BinaryIO] = (
+            open(event_log, 'ab', buffering=0) if event_log else None
+        )
+
+    def observe(self, action: str, context: str, success: bool = True, hour: int = 12) -> None:
         """
         Observe an action and learn from it.
 
@@ -40,26 +67,52 @@ class PatternLearner:
             success: Whether action was successful
             hour: Hour of day (0-23)
         """
+        # Action names repeat across every structure; keep one copy of each
+        action = sys.intern(action)
+
         # Record context
         self.action_contexts[action].append(context)
+        self._index_context(action, context)
 
         # Record success/failure
-        if success:
-            self.action_success[action]['success'] += 1
-        else:
-            self.action_success[action]['failure'] += 1
+        self.action_success[action][0 if success else 1] += 1
 
         # Record time pattern
-        self.time_patterns[action].append(hour)
+        self.time_patterns[action][hour] += 1
+
+        self._action_totals[action] += 1
+        self._total_observations += 1
 
-    def observe_sequence(self, actions: List[str]):
+        if self._event_file is not None:
+            event = {'action': action, 'context': context, 'success': success, 'hour': hour}
+            self._event_file.write(fast_json.dumps(event) + b'\n')
+
+    def _index_context(self, action: str, context: str) -> None:
+        """Cache a context's word set and add it to the inverted index."""
+        words = frozenset(map(sys.intern, context.lower().split()))
+        token_sets = self._ctx_tokens[action]
+        for word in words:
+            self._word_postings[word].append((action, len(token_sets)))
+        token_sets.append(words)
+
+    def observe_sequence(self, actions: List[str]) -> None:
         """
         Observe a sequence of actions.
         """
         if len(actions) >= 2:
+            actions = [sys.intern(action) for action in actions]
             self.sequences.append(actions)
+            self._index_sequence(actions)
+
+            if self._event_file is not None:
+                self._event_file.write(fast_json.dumps({'sequence': actions}) + b'\n')
 
-    def predict_next_action(self, current_context: str, recent_actions: List[str] = None) -> Dict[str, Any]:
+    def _index_sequence(self, actions: List[str]) -> None:
+        """Add a sequence's consecutive pairs to the next-action index."""
+        for action, next_action in zip(actions, actions[1:]):
+            self._bigram_counts[action][next_action] += 1
+
+    def predict_next_action(self, current_context: str, recent_actions: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Predict next action based on context and recent actions.
 
@@ -96,7 +149,7 @@ class PatternLearner:
             'reasoning': 'Not enough data to make a prediction'
         }
 
-    def predict_from_sequences(self, recent_actions: List[str]) -> str:
+    def predict_from_sequences(self, recent_actions: List[str]) -> Optional[str]:
         """
         Predict next action based on action sequences.
         """
@@ -106,51 +159,67 @@ class PatternLearner:
         if not last_action:
             return None
 
-        # Count what comes after this action in past sequences
-        next_actions = []
-        for seq in self.sequences:
-            for i, action in enumerate(seq[:-1]):
-                if action == last_action:
-                    next_actions.append(seq[i + 1])
+        # Look up what came after this action in past sequences
+        next_counts = self._bigram_counts.get(last_action)
 
-        if next_actions:
+        if next_counts:
             # Return most common next action
-            most_common = Counter(next_actions).most_common(1)[0][0]
-            return most_common
+            return max(next_counts, key=next_counts.__getitem__)
 
         return None
 
-    def predict_from_context(self, context: str) -> str:
+    def predict_from_context(self, context: str) -> Optional[str]:
         """
         Predict action based on similar contexts.
         """
-        # Find actions taken in similar contexts
-        context_lower = context.lower()
-
-        similar_actions = []
-        for action, contexts in self.action_contexts.items():
-            for ctx in contexts:
-                if self.contexts_similar(context_lower, ctx.lower()):
-                    similar_actions.append(action)
-
-        if similar_actions:
-            # Return most common action in similar contexts
-            most_common = Counter(similar_actions).most_common(1)[0][0]
-            return most_common
+        query_words = frozenset(context.lower().split())
+
+        # Only contexts sharing at least one word can be similar
+        candidates: Set[Tuple[str, int]] = set()
+        for word in query_words:
+            candidates.update(self._word_postings.get(word, ()))
+
+        # Count actions taken in similar contexts
+        query_len = len(query_words)
+        similar_counts: Dict[str, int] = {}
+        for action, index in candidates:
+            words = self._ctx_tokens[action][index]
+            # Jaccard can never exceed min/max of the set sizes
+            words_len = len(words)
+            if min(query_len, words_len) / max(query_len, words_len) < SIMILARITY_THRESHOLD:
+                continue
+            if len(query_words & words) / len(query_words | words) >= SIMILARITY_THRESHOLD:
+                similar_counts[action] = similar_counts.get(action, 0) + 1
+
+        if similar_counts:
+            # Return most common action in similar contexts; ties go to the
+            # action observed first, as with a full scan
+            return max(
+                (action for action in self._ctx_tokens if action in similar_counts),
+                key=similar_counts.__getitem__
+            )
 
         return None
 
-    def contexts_similar(self, ctx1: str, ctx2: str, threshold: float = 0.3) -> bool:
+    def contexts_similar(self, ctx1: str, ctx2: str, threshold: float = SIMILARITY_THRESHOLD) -> bool:
         """
         Check if two contexts are similar.
         Simple word overlap method.
         """
-        words1 = set(ctx1.split())
-        words2 = set(ctx2.split())
+        return self.words_similar(set(ctx1.split()), set(ctx2.split()), threshold)
 
+    def words_similar(self, words1: Set[str], words2: Set[str], threshold: float = SIMILARITY_THRESHOLD) -> bool:
+        """
+        Check if two word sets are similar (Jaccard overlap).
+        """
         if not words1 or not words2:
             return False
 
+        # Jaccard is bounded by min/max of the set sizes, so skip the set work
+        len1, len2 = len(words1), len(words2)
+        if min(len1, len2) / max(len1, len2) < threshold:
+            return False
+
         overlap = len(words1 & words2)
         total = len(words1 | words2)
 
@@ -161,25 +230,30 @@ class PatternLearner:
         """
         Get success rate for an action.
         """
-        stats = self.action_success[action]
-        total = stats['success'] + stats['failure']
+        # .get so that reads never insert entries into the defaultdict
+        stats = self.action_success.get(action)
+        if stats is None:
+            return 0.5  # Unknown
+
+        successes, failures = stats
+        total = successes + failures
 
         if total == 0:
             return 0.5  # Unknown
 
-        return stats['success'] / total
+        return successes / total
 
     def get_best_time(self, action: str) -> int:
         """
         Get best time of day for an action.
         """
-        times = self.time_patterns.get(action, [])
+        hours = self.time_patterns.get(action)
 
-        if not times:
+        if not hours:
             return 12  # Default to noon
 
-        # Return most common hour
-        return Counter(times).most_common(1)[0][0]
+        # Return most common hour; ties go to the hour seen first
+        return max(hours, key=hours.__getitem__)
 
     def explain_prediction(self, strategy: str, action: str, confidence: float) -> str:
         """
@@ -199,39 +273,88 @@ class PatternLearner:
         return {
             'sequences_learned': len(self.sequences),
             'actions_observed': len(self.action_contexts),
-            'total_observations': sum(
-                len(contexts) for contexts in self.action_contexts.values()
-            ),
-            'most_common_actions': dict(
-                Counter([
-                    action
-                    for contexts in self.action_contexts.values()
-                    for action in contexts
-                ]).most_common(5)
-            )
+            'total_observations': self._total_observations,
+            'most_common_actions': dict(self._action_totals.most_common(5))
         }
 
-    def save(self, filepath: str):
-        """Save learned patterns to file."""
+    def save(self, filepath: str) -> None:
+        """
+        Save learned patterns to file (compact JSON).
+
+        The event log, if any, is truncated afterwards since the snapshot
+        now covers every logged observation.
+        """
         data = {
             'sequences': self.sequences,
-            'action_contexts': dict(self.action_contexts),
-            'action_success': dict(self.action_success),
-            'time_patterns': dict(self.time_patterns)
+            'action_contexts': self.action_contexts,
+            'action_success': self.action_success,
+            'time_patterns': self.time_patterns
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(fast_json.dumps(data))
 
-    def load(self, filepath: str):
-        """Load learned patterns from file."""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if self._event_file is not None:
+            self._event_file.truncate(0)
 
-        self.sequences = data.get('sequences', [])
+    def load(self, filepath: str) -> None:
+        """Load learned patterns from file."""
+        with open(filepath, 'rb') as f:
+            data = fast_json.loads(f.read())
+
+        self.sequences = [
+            [sys.intern(action) for action in actions]
+            for actions in data.get('sequences', [])
+        ]
+        self._bigram_counts = defaultdict(Counter)
+        for actions in self.sequences:
+            self._index_sequence(actions)
         self.action_contexts = defaultdict(list, data.get('action_contexts', {}))
-        self.action_success = defaultdict(
-            lambda: {'success': 0, 'failure': 0},
-            data.get('action_success', {})
-        )
-        self.time_patterns = defaultdict(list, data.get('time_patterns', {}))
+        self._ctx_tokens = defaultdict(list)
+        self._word_postings = defaultdict(list)
+        for action, contexts in self.action_contexts.items():
+            for context in contexts:
+                self._index_context(action, context)
+        self._action_totals = Counter({
+            action: len(contexts) for action, contexts in self.action_contexts.items()
+        })
+        self._total_observations = sum(self._action_totals.values())
+        # Older files store {'success': n, 'failure': m} per action
+        self.action_success = defaultdict(lambda: [0, 0], {
+            action: [counts['success'], counts['failure']] if isinstance(counts, dict) else list(counts)
+            for action, counts in data.get('action_success', {}).items()
+        })
+        # JSON object keys are strings; older files store a list of hours
+        self.time_patterns = defaultdict(Counter, {
+            action: Counter({int(hour): n for hour, n in hours.items()})
+            if isinstance(hours, dict) else Counter(hours)
+            for action, hours in data.get('time_patterns', {}).items()
+        })
+
+    def load_events(self, filepath: str) -> None:
+        """
+        Replay observations from an NDJSON event log, streaming line by line.
+
+        Typically called after load() to pick up events appended since the
+        last save().
+        """
+        # Detach our own log so replayed events are not appended again
+        event_file, self._event_file = self._event_file, None
+        try:
+            with open(filepath, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    event = fast_json.loads(line)
+                    if 'sequence' in event:
+                        self.observe_sequence(event['sequence'])
+                    else:
+                        self.observe(**event)
+        finally:
+            self._event_file = event_file
+
+    def close(self) -> None:
+        """Close the event log, if one is open."""
+        if self._event_file is not None:
+            self._event_file.close()
+            self._event_file = None
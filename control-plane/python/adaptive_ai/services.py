@@ -0,0 +1,23 @@
+"""
+Services - shared component instances
+
+Process-wide instances of the stateless, read-mostly components, so callers
+don't rebuild regex and template tables on every request.
+"""
+
+from functools import lru_cache
+
+from .intent_predictor import IntentPredictor
+from .code_generator import AdaptiveCodeGenerator
+
+
+@lru_cache(maxsize=1)
+def get_intent_predictor() -> IntentPredictor:
+    """Get the shared IntentPredictor."""
+    return IntentPredictor()
+
+
+@lru_cache(maxsize=1)
+def get_code_generator() -> AdaptiveCodeGenerator:
+    """Get the shared AdaptiveCodeGenerator."""
+    return AdaptiveCodeGenerator()
@@ -7,9 +7,17 @@ Integrates with Jarvis Intelligence Engine.
 """
 
 import sys
+from collections import Counter, OrderedDict
 from pathlib import Path
+from typing import List, Optional
 import asyncio
-from flask import Flask, request, jsonify
+import atexit
+import concurrent.futures
+import gc
+import queue
+import threading
+import msgspec
+from flask import Flask, request
 from flask_cors import CORS
 
 # Add adaptive_ai to path
@@ -20,30 +28,342 @@ from adaptive_ai import AdaptiveEngine, IntentPredictor, PatternLearner, Adaptiv
 app = Flask(__name__)
 CORS(app)
 
+
+# Reused for every response; encodes dicts and response structs directly
+_encoder = msgspec.json.Encoder()
+
+
+def json_response(obj, status=200):
+    """Build a JSON response from a dict or response struct."""
+    return app.response_class(_encoder.encode(obj), status=status, mimetype='application/json')
+
+
+class BadRequest(ValueError):
+    """The request body is not valid JSON or does not match its schema."""
+
+
+# Request schemas. Bodies are decoded straight into these structs, so type
+# checks happen inside msgspec's decoder; camelCase JSON keys map to the
+# snake_case fields.
+class PredictIntentRequest(msgspec.Struct, rename='camel'):
+    context: str = ''
+    user_id: str = 'default'
+    recent_actions: List[str] = []
+
+
+class PredictBatchRequest(msgspec.Struct, rename='camel'):
+    items: List[PredictIntentRequest] = []
+
+
+class GenerateCodeRequest(msgspec.Struct, rename='camel'):
+    intent: str = ''
+    context: dict = {}
+    patterns: Optional[dict] = None
+
+
+class LearnPatternRequest(msgspec.Struct, rename='camel'):
+    action: str = ''
+    context: str = ''
+    success: bool = True
+    hour: int = 12
+
+
+class LearnSequenceRequest(msgspec.Struct, rename='camel'):
+    actions: List[str] = []
+
+
+class PredictMemoryRequest(msgspec.Struct, rename='camel'):
+    context: str = ''
+    user_id: str = 'default'
+
+
+class PredictMemoryBatchRequest(msgspec.Struct, rename='camel'):
+    items: List[PredictMemoryRequest] = []
+
+
+class ObserveRequest(msgspec.Struct, rename='camel'):
+    # Left out when missing, so the engine stores str(action) as content
+    description: Optional[str] = None
+    action: str = 'unknown'
+    user_id: str = 'default'
+    success: bool = True
+    context: str = ''
+
+
+class LearnStyleRequest(msgspec.Struct, rename='camel'):
+    code: str = ''
+
+
+# Response schemas, encoded without building intermediate dicts
+class NextAction(msgspec.Struct):
+    action: Optional[str]
+    confidence: float
+    reasoning: str
+
+
+class IntentResponse(msgspec.Struct, rename='camel'):
+    intent: str
+    confidence: float
+    explanation: str
+    next_action: Optional[NextAction]
+
+
+# One reusable decoder per schema
+_decoders = {}
+
+
+def decode(body, schema):
+    """
+    Decode a JSON body into a request schema.
+
+    Raises:
+        BadRequest: body is not valid JSON or does not match the schema
+    """
+    decoder = _decoders.get(schema)
+    if decoder is None:
+        decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise BadRequest(str(e))
+
+
+def parse_body(schema):
+    """Decode the request body into a request schema."""
+    return decode(request.get_data(cache=False), schema)
+
+
 # Global instances
 intent_predictor = IntentPredictor()
 pattern_learner = PatternLearner()
 code_generator = AdaptiveCodeGenerator()
 
-# Adaptive engine requires async context
-adaptive_engine = None
+# PatternLearner is not thread-safe; request threads and the learn worker
+# share it under this lock
+_learner_lock = threading.Lock()
+
+# /learn-pattern and /learn-sequence only enqueue; one worker thread applies
+# observations in batches, taking the learner lock once per batch
+LEARN_BATCH_SIZE = 256
+_learn_queue = queue.Queue(maxsize=10000)
 
 
-def get_adaptive_engine():
-    """Get or create adaptive engine instance."""
+def _learn_worker():
+    while True:
+        batch = [_learn_queue.get()]
+        while len(batch) < LEARN_BATCH_SIZE:
+            try:
+                batch.append(_learn_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        with _learner_lock:
+            for observe, args in batch:
+                try:
+                    observe(*args)
+                except Exception:
+                    app.logger.exception('Failed to learn from %r', args)
+
+        for _ in batch:
+            _learn_queue.task_done()
+
+
+threading.Thread(target=_learn_worker, name='adaptive-ai-learner', daemon=True).start()
+
+
+def wait_for_learning(timeout):
+    """
+    Wait until every queued observation has been learned.
+
+    Like _learn_queue.join(), but gives up after timeout seconds.
+
+    Returns:
+        True if the queue drained, False on timeout
+    """
+    with _learn_queue.all_tasks_done:
+        return _learn_queue.all_tasks_done.wait_for(
+            lambda: not _learn_queue.unfinished_tasks, timeout
+        )
+
+
+def enqueue_learning(observe, *args):
+    """Queue a PatternLearner call; returns False if the queue is full."""
+    try:
+        _learn_queue.put_nowait((observe, args))
+        return True
+    except queue.Full:
+        return False
+
+
+# Adaptive engine requires async context. All async work runs on one event
+# loop in a background thread; the sync handlers submit coroutines to it
+# instead of spinning up a loop per request.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name='adaptive-ai-loop', daemon=True).start()
+
+
+# Seconds a request thread waits on the loop before giving up
+ASYNC_TIMEOUT = 30.0
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the background event loop and wait for its result.
+
+    Raises:
+        concurrent.futures.TimeoutError: no result within ASYNC_TIMEOUT; the
+            coroutine is cancelled so it doesn't keep running on the loop
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _loop)
+    try:
+        return future.result(ASYNC_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+# Open engines keyed by (jarvis_url, api_key), so each keeps its pooled
+# HTTP session and caches across requests. Both come from request headers,
+# so the pool is an LRU capped at ENGINE_POOL_SIZE. Only touched on _loop.
+ENGINE_POOL_SIZE = 32
+_engines = OrderedDict()
+_engines_lock = None
+
+# Requests currently using each engine. An evicted engine is closed once
+# none are left; until then it waits in _retired.
+_engine_users = Counter()
+_retired = set()
+_closing = set()
+
+
+def engine_key():
+    """Jarvis URL and API key for this request's adaptive engine."""
     jarvis_url = request.headers.get('X-Jarvis-URL', 'http://localhost:4000')
     api_key = request.headers.get('Authorization', '').replace('Bearer ', '')
-    return AdaptiveEngine(jarvis_url=jarvis_url, api_key=api_key or 'test-token')
+    return jarvis_url, api_key or 'test-token'
+
+
+def with_engine(key, call):
+    """
+    Run call(engine) on the background loop with the pooled engine for key.
+
+    The engine counts as in use until call returns, so evicting it from the
+    pool never closes it under a running request.
+    """
+    async def run():
+        engine = await _acquire_engine(*key)
+        try:
+            return await call(engine)
+        finally:
+            _release_engine(engine)
+
+    return run_async(run())
+
+
+async def _acquire_engine(jarvis_url, api_key):
+    """Return the open engine for these credentials marked in use, entering it on first use."""
+    global _engines_lock
+    key = (jarvis_url, api_key)
+    engine = _engines.get(key)
+    if engine is not None:
+        _engines.move_to_end(key)
+        _engine_users[engine] += 1
+        return engine
+
+    if _engines_lock is None:
+        # Created here so it belongs to _loop
+        _engines_lock = asyncio.Lock()
+    async with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = await AdaptiveEngine(jarvis_url=jarvis_url, api_key=api_key).__aenter__()
+            _engines[key] = engine
+            if len(_engines) > ENGINE_POOL_SIZE:
+                _, evicted = _engines.popitem(last=False)
+                if _engine_users[evicted]:
+                    _retired.add(evicted)
+                else:
+                    _close_later(evicted)
+        _engine_users[engine] += 1
+    return engine
+
+
+def _release_engine(engine):
+    """Mark one use of engine finished, closing it if it was evicted meanwhile."""
+    _engine_users[engine] -= 1
+    if _engine_users[engine] <= 0:
+        del _engine_users[engine]
+        if engine in _retired:
+            _retired.discard(engine)
+            _close_later(engine)
+
+
+def _close_later(engine):
+    """
+    Flush and close an evicted engine in its own task.
+
+    Not awaited by the request that evicted it, so that request doesn't wait
+    on another tenant's queue, and its timeout can't cancel the close halfway.
+    """
+    task = asyncio.ensure_future(engine.__aexit__(None, None, None))
+    _closing.add(task)
+    task.add_done_callback(_engine_closed)
+
+
+def _engine_closed(task):
+    _closing.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        app.logger.error('Failed to close evicted engine', exc_info=task.exception())
+
+
+async def _close_engines():
+    """Flush and close every pooled or retired engine."""
+    engines = [*_engines.values(), *_retired]
+    _engines.clear()
+    _retired.clear()
+    for engine in engines:
+        await engine.__aexit__(None, None, None)
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
+
+
+@atexit.register
+def _shutdown():
+    wait_for_learning(ASYNC_TIMEOUT)
+    run_async(_close_engines())
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+# Constant, so serialized once for liveness probes
+_HEALTH_BODY = _encoder.encode({
+    'status': 'healthy',
+    'service': 'adaptive-ai',
+    'version': '1.0.0'
+})
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'adaptive-ai',
-        'version': '1.0.0'
-    })
+    return app.response_class(_HEALTH_BODY, mimetype='application/json')
+
+
+def build_intent_response(context, recent_actions, intent, confidence):
+    """Add explanation and next-action prediction to an intent prediction."""
+    explanation = intent_predictor.explain_prediction(intent, confidence, context)
+
+    # Predict next action if we have a sequence
+    next_action = None
+    if recent_actions:
+        with _learner_lock:
+            next_prediction = pattern_learner.predict_next_action(context, recent_actions)
+        next_action = NextAction(
+            next_prediction.get('action'),
+            next_prediction.get('confidence', 0.0),
+            next_prediction.get('reasoning', '')
+        )
+
+    return IntentResponse(intent, confidence, explanation, next_action)
 
 
 @app.route('/predict-intent', methods=['POST'])
@@ -67,37 +387,63 @@ def predict_intent():
         }
     """
     try:
-        data = request.json
-        context = data.get('context', '')
-        user_id = data.get('userId', 'default')
-        recent_actions = data.get('recentActions', [])
+        data = parse_body(PredictIntentRequest)
+        context = data.context
+        recent_actions = data.recent_actions
 
         # Predict intent
         intent, confidence = intent_predictor.predict(context, {
             'recent_actions': recent_actions
         })
 
-        explanation = intent_predictor.explain_prediction(intent, confidence, context)
+        return json_response(build_intent_response(context, recent_actions, intent, confidence))
 
-        # Predict next action if we have a sequence
-        next_action = None
-        if recent_actions:
-            next_prediction = pattern_learner.predict_next_action(context, recent_actions)
-            next_action = {
-                'action': next_prediction.get('action'),
-                'confidence': next_prediction.get('confidence', 0.0),
-                'reasoning': next_prediction.get('reasoning', '')
-            }
-
-        return jsonify({
-            'intent': intent,
-            'confidence': confidence,
-            'explanation': explanation,
-            'nextAction': next_action
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+
+@app.route('/predict-intent/batch', methods=['POST'])
+def predict_intent_batch():
+    """
+    Predict intents for many contexts in one request.
+
+    Body:
+        {
+            "items": [
+                {"context": "string", "userId": "string", "recentActions": [...]},
+                ...
+            ]
+        }
+
+    Returns:
+        {
+            "predictions": [{"intent": ..., "confidence": ..., ...}, ...]
+        }
+    """
+    try:
+        items = parse_body(PredictBatchRequest).items
+        contexts = [item.context for item in items]
+        recent = [item.recent_actions for item in items]
+
+        # Predict all intents in one call
+        predictions = intent_predictor.predict_batch(
+            contexts,
+            [{'recent_actions': actions} for actions in recent]
+        )
+
+        return json_response({
+            'predictions': [
+                build_intent_response(context, actions, intent, confidence)
+                for context, actions, (intent, confidence) in zip(contexts, recent, predictions)
+            ]
         })
 
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @app.route('/generate-code', methods=['POST'])
@@ -119,22 +465,24 @@ def generate_code():
         }
     """
     try:
-        data = request.json
-        intent = data.get('intent', '')
-        context = data.get('context', {})
-        patterns = data.get('patterns')
+        data = parse_body(GenerateCodeRequest)
+        intent = data.intent
+        context = data.context
+        patterns = data.patterns
 
         # Generate code
         code = code_generator.generate(intent, context, patterns)
 
-        return jsonify({
+        return json_response({
             'code': code,
             'language': 'python',
             'intent': intent
         })
 
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @app.route('/learn-pattern', methods=['POST'])
@@ -151,22 +499,25 @@ def learn_pattern():
         }
     """
     try:
-        data = request.json
-        action = data.get('action', '')
-        context = data.get('context', '')
-        success = data.get('success', True)
-        hour = data.get('hour', 12)
+        data = parse_body(LearnPatternRequest)
+        action = data.action
+        context = data.context
+        success = data.success
+        hour = data.hour
 
-        # Observe action
-        pattern_learner.observe(action, context, success, hour)
+        # Observe action in the background
+        if not enqueue_learning(pattern_learner.observe, action, context, success, hour):
+            return json_response({'error': 'Learning queue is full'}, 503)
 
-        return jsonify({
+        return json_response({
             'success': True,
-            'message': 'Pattern learned'
+            'message': 'Pattern queued for learning'
         })
 
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @app.route('/learn-sequence', methods=['POST'])
@@ -180,23 +531,42 @@ def learn_sequence():
         }
     """
     try:
-        data = request.json
-        actions = data.get('actions', [])
+        data = parse_body(LearnSequenceRequest)
+        actions = data.actions
 
-        # Observe sequence
-        pattern_learner.observe_sequence(actions)
+        # Observe sequence in the background
+        if not enqueue_learning(pattern_learner.observe_sequence, actions):
+            return json_response({'error': 'Learning queue is full'}, 503)
 
-        return jsonify({
+        return json_response({
             'success': True,
-            'message': 'Sequence learned'
+            'message': 'Sequence queued for learning'
         })
 
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+# Seconds /flush waits for the learn queue; under steady /learn-* traffic it
+# may never drain, and each waiting request holds a server thread
+FLUSH_TIMEOUT = 5.0
+
+
+@app.route('/flush', methods=['POST'])
+def flush_learning():
+    """Wait until every queued observation has been learned."""
+    if not wait_for_learning(FLUSH_TIMEOUT):
+        return json_response({'error': 'Learning queue did not drain in time'}, 503)
+    return json_response({
+        'success': True,
+        'message': 'Learning queue flushed'
+    })
 
 
 @app.route('/predict-memory', methods=['POST'])
-async def predict_with_memory():
+def predict_with_memory():
     """
     Predict intent using Jarvis memory layer.
 
@@ -216,23 +586,62 @@ async def predict_with_memory():
         }
     """
     try:
-        data = request.json
-        context = data.get('context', '')
-        user_id = data.get('userId', 'default')
+        data = parse_body(PredictMemoryRequest)
+        context = data.context
+        user_id = data.user_id
 
         # Use adaptive engine with memory
-        async with get_adaptive_engine() as engine:
-            prediction = await engine.predict_intent(context, user_id)
-            return jsonify(prediction)
+        prediction = with_engine(engine_key(), lambda engine: engine.predict_intent(context, user_id))
+        return json_response(prediction)
 
+    except concurrent.futures.TimeoutError:
+        return json_response({'error': 'Jarvis memory layer timed out'}, 504)
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+@app.route('/predict-memory/batch', methods=['POST'])
+def predict_with_memory_batch():
+    """
+    Predict intents using Jarvis memory layer for many contexts in one request.
+
+    Memory recalls for all items run concurrently; an item whose recall
+    fails or times out falls back to locally observed patterns.
+
+    Body:
+        {
+            "items": [
+                {"context": "string", "userId": "string"},
+                ...
+            ]
+        }
+
+    Returns:
+        {
+            "predictions": [{"intent": ..., "confidence": ..., ...}, ...]
+        }
+    """
+    try:
+        items = [(item.context, item.user_id) for item in parse_body(PredictMemoryBatchRequest).items]
+
+        # Use adaptive engine with memory, fanning out the recalls
+        predictions = with_engine(engine_key(), lambda engine: engine.predict_intents(items))
+        return json_response({'predictions': predictions})
+
+    except concurrent.futures.TimeoutError:
+        return json_response({'error': 'Jarvis memory layer timed out'}, 504)
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
 
 
 @app.route('/observe', methods=['POST'])
-async def observe_action():
+def observe_action():
     """
-    Observe user action and store in memory.
+    Observe user action and queue it for storage in memory.
 
     Body:
         {
@@ -242,21 +651,89 @@ async def observe_action():
             "success": true,
             "context": "string"
         }
+
+    Bulk uploads can send one such object per line with Content-Type
+    application/x-ndjson; the body is streamed rather than buffered.
     """
     try:
-        data = request.json
-
-        # Use adaptive engine to observe
-        async with get_adaptive_engine() as engine:
-            await engine.observe_action(data)
+        key = engine_key()
 
-            return jsonify({
+        if request.mimetype == 'application/x-ndjson':
+            observed = observe_stream(key)
+            return json_response({
                 'success': True,
-                'message': 'Action observed and stored'
+                'observed': observed,
+                'message': 'Actions queued for storage'
             })
 
+        action = observed_action(request.get_data(cache=False))
+
+        # Use adaptive engine to observe
+        with_engine(key, lambda engine: engine.observe_action(action))
+
+        return json_response({
+            'success': True,
+            'message': 'Action queued for storage'
+        })
+
+    except concurrent.futures.TimeoutError:
+        return json_response({'error': 'Jarvis memory layer timed out'}, 504)
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+def observed_action(body):
+    """Decode an /observe body into the action dict AdaptiveEngine expects."""
+    action = msgspec.structs.asdict(decode(body, ObserveRequest))
+    return {name: value for name, value in action.items() if value is not None}
+
+
+# Lines handed to the engine per loop round trip when streaming /observe
+OBSERVE_STREAM_BATCH = 64
+
+
+def observe_stream(key):
+    """
+    Observe NDJSON actions from the request body line by line.
+
+    Actions go to the engine in batches of OBSERVE_STREAM_BATCH, and the
+    engine's bounded action queue makes each batch wait while the memory
+    layer catches up, so memory stays bounded whatever the upload size.
+    A bad line stops the upload; every line before it is still observed.
+
+    Returns:
+        Number of actions observed
+    """
+    batch = []
+    observed = 0
+    for number, line in enumerate(request.stream, 1):
+        if not line.strip():
+            continue
+        try:
+            action = observed_action(line)
+        except BadRequest as e:
+            observe_all(key, batch)
+            raise BadRequest(f'Line {number}: {e}')
+
+        batch.append(action)
+        if len(batch) >= OBSERVE_STREAM_BATCH:
+            observe_all(key, batch)
+            observed += len(batch)
+            batch = []
+
+    observe_all(key, batch)
+    return observed + len(batch)
+
+
+def observe_all(key, actions):
+    """Hand actions to the pooled engine for key in one loop round trip."""
+    async def observe(engine):
+        for action in actions:
+            await engine.observe_action(action)
+
+    with_engine(key, observe)
 
 
 @app.route('/stats', methods=['GET'])
@@ -266,15 +743,16 @@ def get_stats():
         user_id = request.args.get('userId', 'default')
 
         # Get pattern learner stats
-        learner_stats = pattern_learner.get_stats()
+        with _learner_lock:
+            learner_stats = pattern_learner.get_stats()
 
-        return jsonify({
+        return json_response({
             'patternLearner': learner_stats,
             'userId': user_id
         })
 
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @app.route('/style/learn', methods=['POST'])
@@ -288,19 +766,37 @@ def learn_style():
         }
     """
     try:
-        data = request.json
-        user_code = data.get('code', '')
+        data = parse_body(LearnStyleRequest)
+        user_code = data.code
 
         # Learn style
         code_generator.learn_style(user_code)
 
-        return jsonify({
+        return json_response({
             'success': True,
             'message': 'Style learned'
         })
 
+    except BadRequest as e:
+        return json_response({'error': str(e)}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+def _warmup():
+    """Run each request path once so the first real request isn't the slow one."""
+    intent_predictor.predict('warmup', {'recent_actions': []})
+    with _learner_lock:
+        pattern_learner.predict_next_action('warmup', ['warmup'])
+    code_generator.generate('code_generation', {}, None)
+    decode(b'{"context": "warmup"}', PredictIntentRequest)
+
+
+_warmup()
+
+# Everything allocated so far lives for the whole process; keep it out of
+# the collector's generations so request-time GC passes stay short
+gc.freeze()
 
 
 if __name__ == '__main__':
@@ -314,14 +810,25 @@ if __name__ == '__main__':
     print(f"Endpoints:")
     print(f"  GET  /health - Health check")
     print(f"  POST /predict-intent - Predict user intent")
+    print(f"  POST /predict-intent/batch - Predict intents in bulk")
     print(f"  POST /generate-code - Generate adaptive code")
     print(f"  POST /learn-pattern - Learn from action")
     print(f"  POST /learn-sequence - Learn action sequence")
+    print(f"  POST /flush - Wait for queued learning")
     print(f"  POST /predict-memory - Predict with memory layer")
-    print(f"  POST /observe - Observe and store action")
+    print(f"  POST /predict-memory/batch - Predict with memory layer in bulk")
+    print(f"  POST /observe - Observe and queue action for storage")
     print(f"  GET  /stats - Learning statistics")
     print(f"  POST /style/learn - Learn coding style")
     print("=" * 70)
     print()
 
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # One process: the learner and engine pool are in-memory state, so scale
+    # with threads rather than worker processes
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug fallback, without the debugger and reloader
+        app.run(host='0.0.0.0', port=port, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=port, threads=int(os.environ.get('THREADS', 16)))
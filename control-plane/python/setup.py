@@ -0,0 +1,19 @@
+"""
+Build script for adaptive_ai.
+
+Metadata lives in pyproject.toml. Setting ADAPTIVE_AI_MYPYC=1 compiles the
+pattern learner with mypyc (needs mypy installed and
+``pip install --no-build-isolation``); otherwise the package is pure Python.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get('ADAPTIVE_AI_MYPYC') == '1':
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(['--follow-imports=silent', 'adaptive_ai/pattern_learner.py'])
+
+setup(ext_modules=ext_modules)
@@ -0,0 +1,108 @@
+"""
+Engine pool tests for the adaptive AI service.
+
+Run from control-plane/python with: python -m unittest discover tests
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import adaptive_ai_service as service
+
+
+RECALL_DELAY = 0.5
+
+
+async def _recall(request):
+    """Slow stand-in for the memory layer's recall endpoint."""
+    body = await request.json()
+    await asyncio.sleep(RECALL_DELAY)
+    return web.json_response({'results': [
+        {'content': f'ctx {i}', 'metadata': {'action': 'data_loading'}}
+        for i in range(body['limit'])
+    ]})
+
+
+async def _remember(request):
+    await request.json()
+    return web.json_response({'success': True})
+
+
+class EnginePoolEvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        self.runner = asyncio.run_coroutine_threadsafe(self._start_memory_layer(), self.loop).result()
+        self.jarvis_url = f'http://127.0.0.1:{self.runner.addresses[0][1]}'
+
+        self.pool_size = service.ENGINE_POOL_SIZE
+        service.ENGINE_POOL_SIZE = 1
+
+    def tearDown(self):
+        service.ENGINE_POOL_SIZE = self.pool_size
+        service.run_async(service._close_engines())
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join()
+        self.loop.close()
+
+    async def _start_memory_layer(self):
+        app = web.Application()
+        app.router.add_post('/api/v1/memory/recall', _recall)
+        app.router.add_post('/api/v1/memory/remember', _remember)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        return runner
+
+    def _predict(self, api_key, context):
+        return service.app.test_client().post(
+            '/predict-memory',
+            json={'context': context, 'userId': 'u1'},
+            headers={'X-Jarvis-URL': self.jarvis_url, 'Authorization': f'Bearer {api_key}'}
+        )
+
+    def test_eviction_waits_for_in_flight_request(self):
+        responses = {}
+        slow = threading.Thread(target=lambda: responses.update(k1=self._predict('k1', 'first')))
+        slow.start()
+        time.sleep(RECALL_DELAY / 5)
+
+        # Evicts k1's engine while its recall is still running
+        second = self._predict('k2', 'second')
+        slow.join()
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(responses['k1'].status_code, 200)
+        self.assertEqual(responses['k1'].get_json()['intent'], 'data_loading')
+        self.assertEqual(list(service._engines), [(self.jarvis_url, 'k2')])
+
+    def test_evicted_engine_closes_once_idle(self):
+        engines = []
+
+        async def capture(engine):
+            engines.append(engine)
+
+        service.with_engine((self.jarvis_url, 'k1'), capture)
+        service.with_engine((self.jarvis_url, 'k2'), capture)
+
+        deadline = time.monotonic() + 5
+        while engines[0].session is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNone(engines[0].session)
+        self.assertIsNotNone(engines[1].session)
+        self.assertFalse(service._retired)
+
+
+if __name__ == '__main__':
+    unittest.main()